@@ -1,17 +1,348 @@
+import asyncio
+import copy
+import functools
+import hashlib
+import html
+import json
+import logging
+import os
 import re # For parsing reference strings
+import sqlite3
+import threading
+import time
+import unicodedata
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
 from difflib import SequenceMatcher
 from urllib.parse import quote_plus
 
+try: # Optional: rapidfuzz's C++ Levenshtein is much faster than difflib for title scoring
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+try: # process.cdist returns a NumPy array, so the vectorized path also needs numpy
+    import numpy
+except ImportError:
+    numpy = None
+try: # Optional: orjson decodes the bytes payload directly and is several times faster than json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler()) # Applications decide where (and whether) messages go
+
 # --- Constants ---
 CROSSREF_API_BASE_URL = "https://api.crossref.org/v1"
-# TODO: User should ideally configure their actual email for the Mailto parameter.
+# TODO: User should ideally configure their actual email; it is sent in the User-Agent and From headers.
 DEFAULT_MAILTO_EMAIL = "anonymous@example.com" # REPLACE_WITH_YOUR_EMAIL@example.com
 # TODO: User might want to update the repository URL if this script is hosted elsewhere.
-DEFAULT_USER_AGENT = f"CrossRefBot/1.1 (Python-Requests; mailto:{DEFAULT_MAILTO_EMAIL}; https://github.com/YOUR_USERNAME/YOUR_REPO_NAME/blob/main/crossref_bot.py)"
+DEFAULT_USER_AGENT = f"CrossRefBot/1.1 (Python-Requests; mailto:{DEFAULT_MAILTO_EMAIL}; https://github.com/cosialm/crossref)"
+# Fields requested via the `select` parameter unless a caller asks for others; these are
+# all that find_and_cite_reference reads (for scoring and for format_apa), and full work
+# records are many times larger.
+APA_SELECT_FIELDS = "DOI,author,issued,title,container-title,volume,issue,page"
+DEFAULT_SELECT_FIELDS = APA_SELECT_FIELDS + ",published-print,published-online,created"
+# Maximum number of DOIs combined into one filter=doi:...,doi:... request (keeps the URL short)
+DOI_BATCH_SIZE = 20
+# (connect, read) timeouts in seconds; without one a stalled connection blocks its caller forever
+REQUEST_TIMEOUT = (3.05, 30)
+
+# --- HTTP Session ---
+# A single module-level session keeps TCP+TLS connections to api.crossref.org alive
+# between calls instead of paying a fresh handshake for every request.
+_SESSION = requests.Session()
+# urllib3's ACCEPT_ENCODING lists br (and zstd) only when a decoder for it is installed,
+# so installing brotli shrinks the JSON responses further without risking undecodable bodies.
+# Set explicitly because requests before 2.32 hard-codes "gzip, deflate" as its default.
+# The contact address travels in the User-Agent and From headers of every request, which is
+# what places it in Crossref's Polite Pool; no per-request mailto parameter is needed.
+_SESSION.headers.update({"User-Agent": DEFAULT_USER_AGENT, "From": DEFAULT_MAILTO_EMAIL,
+                         "Accept-Encoding": ACCEPT_ENCODING})
+_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    # Retry throttling (429) and transient server errors, waiting as long as Crossref's
+    # Retry-After header asks before falling back to exponential backoff
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=frozenset({"GET"}), respect_retry_after_header=True),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_ua(mailto_email):
+    """Returns DEFAULT_USER_AGENT with its contact address swapped for mailto_email, if one is given."""
+    if not mailto_email or mailto_email == DEFAULT_MAILTO_EMAIL:
+        return DEFAULT_USER_AGENT
+    return DEFAULT_USER_AGENT.replace(DEFAULT_MAILTO_EMAIL, mailto_email)
+
+
+def _identity_headers(mailto_email, user_agent):
+    """
+    Returns the User-Agent/From headers to send instead of the session defaults, or an
+    empty dict when the caller asked for neither a custom address nor a custom User-Agent.
+    """
+    if not user_agent and (not mailto_email or mailto_email == DEFAULT_MAILTO_EMAIL):
+        return {}
+    effective_mailto = mailto_email or DEFAULT_MAILTO_EMAIL
+    return {"User-Agent": user_agent or _build_ua(effective_mailto), "From": effective_mailto}
+
+# --- Rate Limiting ---
+# Crossref advertises its current limit on every response (X-Rate-Limit-Limit: 50,
+# X-Rate-Limit-Interval: 1s); until the first response arrives we assume these defaults.
+DEFAULT_RATE_LIMIT = 50
+DEFAULT_RATE_LIMIT_INTERVAL = 1.0
+_INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket holding `capacity` tokens that refill evenly over `interval`
+    seconds. acquire() blocks until a request may be sent; update() adopts the limits
+    Crossref reports in each response's headers.
+    """
+
+    def __init__(self, capacity=DEFAULT_RATE_LIMIT, interval=DEFAULT_RATE_LIMIT_INTERVAL):
+        self.capacity = capacity
+        self.interval = interval
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.interval)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) * self.interval / self.capacity
+            time.sleep(wait)
+
+    def update(self, headers):
+        limit = headers.get("X-Rate-Limit-Limit")
+        interval = headers.get("X-Rate-Limit-Interval")
+        if not limit or not interval:
+            return
+        try:
+            capacity = int(limit)
+            unit = interval[-1] if interval[-1] in _INTERVAL_UNITS else "s"
+            seconds = float(interval.rstrip("".join(_INTERVAL_UNITS))) * _INTERVAL_UNITS[unit]
+        except ValueError:
+            return
+        if capacity > 0 and seconds > 0:
+            with self._lock:
+                self._refill(time.monotonic())
+                self.capacity, self.interval = capacity, seconds
+                self.tokens = min(self.tokens, capacity)
+
+
+_RATE_LIMITER = _RateLimiter()
+
+
+def _rate_limited_get(url, **kwargs):
+    """_SESSION.get, gated by the shared token bucket and feeding back the advertised limits."""
+    _RATE_LIMITER.acquire()
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+    response = _SESSION.get(url, **kwargs)
+    _RATE_LIMITER.update(response.headers)
+    return response
+
+
+# Requests currently being performed, keyed by request fingerprint (see _single_flight)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _single_flight(key, fetch):
+    """
+    Calls fetch() for the first caller with a given key. Callers arriving with the same key
+    while that call is still running wait for it and share its result instead of sending a
+    duplicate request. Every caller gets its own deep copy; the object held by the shared
+    future is never handed out, so one caller mutating its result can't affect another.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = _inflight[key] = Future()
+    if not is_leader:
+        return copy.deepcopy(future.result())
+    try:
+        result = fetch()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return copy.deepcopy(result)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+# --- On-Disk Cache ---
+CACHE_DIR = os.path.expanduser("~/.cache/crossref_bot")
+CITATION_CACHE_TTL = 30 * 86400 # APA output for a DOI is effectively immutable
+NEGATIVE_CACHE_TTL = 3600 # Confirmed misses are retried after an hour
+SEARCH_CACHE_TTL = 86400 # Search results are reused across runs for a day
+SEARCH_MEMO_TTL = 3600 # ...and within a process for at most an hour on top of that
+MAX_STALENESS = 7 * 86400 # Expired entries may stand in for a failed request for a week, then are purged
+
+
+class _DiskCache:
+    """
+    Minimal persistent key/value store with per-entry expiry, backed by SQLite.
+    Values must be JSON-serialisable. The database is opened lazily (one connection
+    per thread) and any SQLite failure degrades to a cache miss rather than an error.
+    Expired entries stay readable (via max_stale) for keep_expired seconds and are
+    deleted when the next connection is opened after that.
+    """
+
+    def __init__(self, path, keep_expired=0):
+        self.path = path
+        self.keep_expired = keep_expired
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+                conn.execute("DELETE FROM cache WHERE expires < ?", (time.time() - self.keep_expired,))
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None, max_stale=0):
+        """Returns the value stored under key, accepting it up to max_stale seconds past its expiry."""
+        try:
+            row = self._connect().execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        except (OSError, sqlite3.Error):
+            return default
+        if row is None or (row[1] is not None and row[1] + max_stale < time.time()):
+            return default
+        return json.loads(row[0])
+
+    def set(self, key, value, expire=None):
+        expires = time.time() + expire if expire else None
+        try:
+            conn = self._connect()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                             (key, json.dumps(value), expires))
+        except (OSError, sqlite3.Error):
+            pass
+
+
+_cache = _DiskCache(os.path.join(CACHE_DIR, "cache.sqlite3"), keep_expired=MAX_STALENESS)
+
+
+def _fingerprint(obj):
+    """Returns a stable short hash of a JSON-serialisable object, for use as a cache key."""
+    return hashlib.blake2b(json.dumps(obj, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+# --- Precompiled Patterns ---
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_AUTHOR_HEAD_RE = re.compile(r"^(.*?)(?=\s*(?:\(\d{4}\)|\"\w|\'\w|[\w\s]+[.:]\s*\w))")
+_AUTHOR_SPLIT_RE = re.compile(r'\s*&\s*|\s+and\s+|\s*,\s*(?=[A-Z])')
+_NAME_RE = re.compile(r"([A-Z][a-z'-]+)")
+_DOI_RE = re.compile(r'10\.\d{4,9}/[-._;()/:A-Z0-9]+', re.IGNORECASE)
+_INITIALS_SPLIT_RE = re.compile(r'[\s.]+')
+_CAPITALIZED_WORD_RE = re.compile(r'\b[A-Z][a-z]')
+_YEAR_PAREN_RE = re.compile(r'\((\d{4})\)')
+_YEAR_BARE_RE = re.compile(r'\b(\d{4})\b')
+_SURNAME_INITIAL_RE = re.compile(r"([A-Z][a-zA-Z\-']+),\s*[A-Z]\.")
+# The title ends before a venue cue ("In ", "Vol.", "... Journal", a DOI link), before a
+# sentence such as ". Nature, 596" that names the source followed by its volume, or at the end.
+_TITLE_HEAD_RE = re.compile(r'^(.*?)(?=\s+(?:In\s|Vol\.|[A-Z][a-zÀ-ÿ\s]+(?:Journal|Conference|Proceedings|Book|Press|University|Review)|https://doi\.org|doi:)|(?<=[.?!])\s+[A-Z][^.]*?,\s*\d|\s*$)')
+# JATS/HTML inline markup (<i>, <sub>, <scp>, ...) that Crossref leaves in titles
+_MARKUP_TAG_RE = re.compile(r'</?[A-Za-z][\w:.-]*(?:\s[^<>]*)?/?>')
+_TITLE_TAIL_RE = re.compile(r'\.\s+(?:[A-Z][\w\s&]+(?:Journal|Conf|Proc|Rev|Bull)|Vol\.|pp\.|\d+[:\-\(]).*$')
+
+
+@functools.lru_cache(maxsize=256)
+def _year_bounded_re(year):
+    """Returns the compiled pattern matching a year, bare or in parentheses, with an optional trailing period."""
+    return re.compile(r'(\(\s*' + re.escape(year) + r'\s*\)|' + re.escape(year) + r')\.?')
 
 
 # --- Helper Functions ---
+class _PunctuationTable(dict):
+    """
+    str.translate table that deletes every character _NON_WORD_RE would remove.
+    Entries are computed on first sight of each character and memoized, so the
+    table covers all of Unicode without being built up front.
+    """
+
+    def __missing__(self, codepoint):
+        self[codepoint] = None if _NON_WORD_RE.match(chr(codepoint)) else codepoint
+        return self[codepoint]
+
+
+_PUNCT_TABLE = _PunctuationTable()
+
+
+def _normalize_title(title):
+    """
+    Lowercases a title and keeps only word characters and spaces, for similarity scoring.
+    NFKD decomposition first splits accented letters into base letter plus combining mark
+    (which the punctuation table then drops) and folds ligatures and full-width forms, so
+    "Schrödinger" in a reference matches "Schrodinger" in Crossref metadata.
+    """
+    return unicodedata.normalize("NFKD", title or "").lower().strip().translate(_PUNCT_TABLE)
+
+
+def _title_similarities(query, candidates):
+    """
+    Returns a list of 0..1 similarity ratios between a normalized query title and each
+    normalized candidate title; empty titles score 0.0. With rapidfuzz and numpy installed
+    the whole batch is scored in a single multi-threaded process.cdist call, otherwise
+    each pair goes through rapidfuzz.fuzz.ratio or difflib.SequenceMatcher. Crossref often
+    returns the same title several times (versions, corrections), so each distinct title is
+    scored only once.
+    """
+    if not query:
+        return [0.0] * len(candidates)
+    unique = list(dict.fromkeys(candidates))
+    if process is not None and numpy is not None:
+        scores = [score / 100.0 for score in process.cdist([query], unique, scorer=fuzz.ratio, workers=-1)[0].tolist()]
+    elif fuzz is not None:
+        scores = [fuzz.ratio(query, candidate) / 100.0 for candidate in unique]
+    else:
+        scores = [SequenceMatcher(None, query, candidate).ratio() if candidate else 0.0 for candidate in unique]
+    score_by_title = dict(zip(unique, scores))
+    return [score_by_title[candidate] for candidate in candidates]
+
+
+# search_params keys that map one-to-one onto a /works query field
+_QUERY_KEY_MAP = (
+    ("keyword", "query.bibliographic"), # Generally recommended for broad keyword/phrase searches
+    ("title", "query.title"),
+    ("author", "query.author"),
+    ("doi", "query.doi"), # DOI can be a query or a filter. Let's try query first.
+    ("affiliation", "query.affiliation"), # query.affiliation might not be a dedicated field, but can be tried
+)
+# search_params keys that map one-to-one onto a /works filter. Values are left unencoded:
+# requests percent-encodes the whole filter parameter once, so quoting them here as well
+# would double-encode DOIs such as funder 10.13039/100000001.
+_FILTER_KEY_MAP = (
+    ("issn", "issn"),
+    ("funding_agency_doi", "funder"),
+    ("publication_type", "type"),
+)
+
+
 def _build_api_params(search_params, rows):
     """
     Constructs the dictionary of parameters for the CrossRef API /works endpoint
@@ -33,58 +364,73 @@ def _build_api_params(search_params, rows):
             "open_access" (bool): Placeholder for potential OA filter.
             "cited_by_doi" (str): Placeholder for potential citation filter.
             "raw_filters" (list of str): List of pre-formatted filter strings.
+            "select" (str or list of str): Fields to return, comma-separated or as a sequence.
+                            Defaults to DEFAULT_SELECT_FIELDS; set to None to request full work records.
+            "filter" (str): A pre-joined, comma-separated filter string. Merged into raw_filters by get_new_works.
+            "sort" (str), "order" (str): Passed through to the API unchanged.
+            "cursor" (str): Deep-paging cursor ("*" for the first page, then each response's next-cursor).
         rows (int): Number of results to request from the API.
 
     Returns:
         dict: A dictionary of parameters suitable for requests.get() targeting the CrossRef API.
     """
+    api_request_params = _build_query_params(search_params)
+
+    filters = _build_filters(search_params)
+    if filters:
+        api_request_params["filter"] = ",".join(filters)
+
+    api_request_params["rows"] = max(1, min(rows, 1000)) # Ensure rows is between 1 and 1000
+
+    # Only ask for the fields we need; full records (abstracts, reference lists) are much larger
+    select = search_params.get("select", DEFAULT_SELECT_FIELDS)
+    if select:
+        api_request_params["select"] = select if isinstance(select, str) else ",".join(select)
+
+    # Sorting and cursor-based deep paging
+    for passthrough_key in ("sort", "order", "cursor"):
+        if search_params.get(passthrough_key):
+            api_request_params[passthrough_key] = search_params[passthrough_key]
+
+    return api_request_params
+
+
+def _build_query_params(search_params):
+    """Returns the query.* parameters for search_params (see _build_api_params)."""
     api_request_params = {}
-    filters = []
 
-    # General keyword query
-    if search_params.get("keyword"):
-        # Using query.bibliographic as it's generally recommended for broad keyword/phrase searches
-        api_request_params["query.bibliographic"] = search_params["keyword"]
-
-    # Field-specific queries
-    if search_params.get("title"):
-        api_request_params["query.title"] = search_params["title"]
-    if search_params.get("author"):
-        api_request_params["query.author"] = search_params["author"]
-    # DOI can be a query or a filter. Let's try query first.
-    if search_params.get("doi"):
-        api_request_params["query.doi"] = search_params["doi"]
-    if search_params.get("affiliation"): # query.affiliation might not be a dedicated field, but can be tried
-        api_request_params["query.affiliation"] = search_params["affiliation"]
+    # Keyword and field-specific queries
+    for key, query_field in _QUERY_KEY_MAP:
+        if search_params.get(key):
+            api_request_params[query_field] = search_params[key]
     if search_params.get("funding_agency_name"):
         # This might be better as a general query if not a specific query field.
         # For now, let's assume it contributes to a general query if "keyword" isn't also present.
         if not api_request_params.get("query.bibliographic") and not search_params.get("keyword"):
             api_request_params["query.bibliographic"] = search_params["funding_agency_name"]
         # Alternatively, it might be part of a filter if the API supports it, e.g., funder-name:
-        # filters.append(f"funder-name:{quote_plus(search_params['funding_agency_name'])}")
+        # filters.append(f"funder-name:{search_params['funding_agency_name']}")
+    return api_request_params
 
 
-    # Filters
-    if search_params.get("issn"):
-        filters.append(f"issn:{quote_plus(search_params['issn'])}")
+def _build_filters(search_params):
+    """Returns the individual "name:value" filter strings for search_params (see _build_api_params)."""
+    filters = []
+    for key, filter_name in _FILTER_KEY_MAP:
+        if search_params.get(key):
+            filters.append(f"{filter_name}:{search_params[key]}")
 
     pub_year_from = search_params.get("publication_year_from")
     pub_year_to = search_params.get("publication_year_to")
 
     if pub_year_from and pub_year_to:
-        filters.append(f"from-pub-date:{pub_year_from}-01-01,until-pub-date:{pub_year_to}-12-31")
+        filters.append(f"from-pub-date:{pub_year_from}-01-01")
+        filters.append(f"until-pub-date:{pub_year_to}-12-31")
     elif pub_year_from:
         filters.append(f"from-pub-date:{pub_year_from}-01-01")
     elif pub_year_to:
         filters.append(f"until-pub-date:{pub_year_to}-12-31")
 
-    if search_params.get("funding_agency_doi"):
-        filters.append(f"funder:{quote_plus(search_params['funding_agency_doi'])}")
-
-    if search_params.get("publication_type"):
-        filters.append(f"type:{quote_plus(search_params['publication_type'])}")
-
     # Open Access - This is a placeholder; actual filter needs API doc confirmation
     # Example: if search_params.get("open_access"): filters.append("is-oa:true")
     # Example: if search_params.get("open_access"): filters.append("has-license:true")
@@ -93,28 +439,17 @@ def _build_api_params(search_params, rows):
     # if search_params.get("cited_by_doi"):
         # This might not be a simple filter. It could be a parameter like `cited-by=<DOI>`
         # or require a different endpoint. For now, let's assume it could be a filter if supported.
-        # filters.append(f"cites:{quote_plus(search_params['cited_by_doi'])}") # Hypothetical
+        # filters.append(f"cites:{search_params['cited_by_doi']}") # Hypothetical
 
     # Raw filters
     if search_params.get("raw_filters"):
         filters.extend(search_params["raw_filters"])
-
-    if filters:
-        api_request_params["filter"] = ",".join(filters)
-
-    api_request_params["rows"] = max(1, min(rows, 1000)) # Ensure rows is between 1 and 1000
-
-    # Add mailto for polite API usage (though it's usually a header)
-    # The API docs say "include a mailto parameter with a valid email address"
-    # This seems to imply it's a query parameter, not just a header.
-    # Let's add it if not already present.
-    # if mailto_email and "mailto" not in api_request_params:
-    #     api_request_params["mailto"] = mailto_email
-
-    return api_request_params
+    if search_params.get("filter"):
+        filters.extend(search_params["filter"].split(","))
+    return filters
 
 # --- Core API Interaction Functions ---
-def search_crossref_api(search_params, rows=10, mailto_email=None, user_agent=None):
+def search_crossref_api(search_params, rows=10, mailto_email=None, user_agent=None, cache=True):
     """
     Performs a search against the CrossRef API's /works endpoint using structured search parameters.
 
@@ -122,9 +457,12 @@ def search_crossref_api(search_params, rows=10, mailto_email=None, user_agent=No
         search_params (dict or str): A dictionary containing structured search criteria (see _build_api_params)
                                      OR a simple string for a basic keyword query (for backward compatibility).
         rows (int, optional): Number of results to return. Defaults to 10. Max 1000.
-        mailto_email (str, optional): Email address to include in the Mailto parameter and User-Agent string
+        mailto_email (str, optional): Email address to include in the User-Agent and From headers
                                       for polite API usage. Defaults to DEFAULT_MAILTO_EMAIL.
         user_agent (str, optional): Custom User-Agent string. Defaults to DEFAULT_USER_AGENT.
+        cache (bool, optional): Reuse the results of an identical earlier search, from memory or
+                                from the on-disk cache (SEARCH_CACHE_TTL). Defaults to True;
+                                pass False when fresh results matter.
 
     Returns:
         list: A list of work items (dictionaries) from the CrossRef API response,
@@ -136,45 +474,124 @@ def search_crossref_api(search_params, rows=10, mailto_email=None, user_agent=No
         if isinstance(search_params, str):
              search_params = {"keyword": search_params}
         else:
-            print("Error: search_params must be a dictionary or a query string.")
+            logger.error("search_params must be a dictionary or a query string.")
             return None
 
+    if cache:
+        # Key the caches on the request actually sent, so a change to the defaults filled in by
+        # _build_api_params (e.g. DEFAULT_SELECT_FIELDS) doesn't serve results fetched without it
+        request_json = json.dumps(_build_api_params(search_params, rows), sort_keys=True)
+        try:
+            items = _search_crossref_cached(request_json, mailto_email, user_agent, int(time.time() // SEARCH_MEMO_TTL))
+        except _LookupFailed:
+            # Stale results beat none at all, but they are not memoized
+            items = _cache.get(_search_cache_key(request_json), max_stale=MAX_STALENESS)
+            if items is None:
+                return None
+        return copy.deepcopy(list(items)) # Deep copies, so callers can't alter the cached items or their nested lists
+
+    message = _query_works(search_params, rows, mailto_email, user_agent)
+    if message is None:
+        return None
+    return message.get("items", []) # Safely access items
+
+
+class _LookupFailed(Exception):
+    """Raised inside lru_cache'd helpers so that failed lookups are not memoized."""
+
+
+def _search_cache_key(request_json):
+    """Disk cache key for the /works request whose canonical (sorted-key JSON) parameters are request_json."""
+    return "search::" + _fingerprint(request_json)
+
+
+@functools.lru_cache(maxsize=1024)
+def _search_crossref_cached(request_json, mailto_email, user_agent, memo_period):
+    """
+    Memoized search keyed on the canonical (sorted-key JSON) form of the request parameters.
+    Results are also persisted in the disk cache for SEARCH_CACHE_TTL. memo_period changes
+    every SEARCH_MEMO_TTL seconds, which retires the in-process entries. Raises _LookupFailed
+    if the request fails. Returns the items as a tuple.
+    """
+    disk_key = _search_cache_key(request_json)
+    items = _cache.get(disk_key)
+    if items is None:
+        message = _send_works_query(json.loads(request_json), mailto_email, user_agent)
+        if message is None:
+            raise _LookupFailed
+        items = message.get("items", [])
+        _cache.set(disk_key, items, expire=SEARCH_CACHE_TTL)
+    return tuple(items)
+
+
+def _query_works(search_params, rows, mailto_email=None, user_agent=None, conditional=False):
+    """
+    Sends one request to the /works endpoint and returns the decoded "message" object
+    (items plus paging fields such as next-cursor), or None if the request fails.
+    With conditional=True the response's ETag/Last-Modified validators are remembered in
+    the disk cache and sent back on the next identical request, so an unchanged result
+    set costs a body-less 304 instead of a full download.
+    """
+    return _send_works_query(_build_api_params(search_params, rows), mailto_email, user_agent, conditional)
+
+
+def _send_works_query(api_request_params, mailto_email=None, user_agent=None, conditional=False):
+    """_query_works for an already built /works parameter dict."""
     api_endpoint = f"{CROSSREF_API_BASE_URL}/works"
-    api_request_params = _build_api_params(search_params, rows)
+    headers = _identity_headers(mailto_email, user_agent)
 
-    effective_mailto = mailto_email or DEFAULT_MAILTO_EMAIL
-    effective_user_agent = user_agent or DEFAULT_USER_AGENT.replace(DEFAULT_MAILTO_EMAIL, effective_mailto)
+    # Identical requests already in flight on other threads are joined rather than repeated
+    request_key = _fingerprint([api_endpoint, api_request_params, headers])
+    validators_key = "validators::" + request_key if conditional else None
+    return _single_flight(request_key, lambda: _fetch_works_message(api_endpoint, api_request_params, headers, validators_key))
 
-    headers = {
-        "User-Agent": effective_user_agent
-    }
-    # The "mailto" parameter in query params is also mentioned, let's add it here too if _build_api_params didn't
-    if "mailto" not in api_request_params:
-        api_request_params["mailto"] = effective_mailto
 
+def _fetch_works_message(api_endpoint, api_request_params, headers, validators_key=None):
+    """
+    Performs the GET for _query_works and returns the decoded "message" object, or None on error.
+    If validators_key is given, the request is made conditional on the validators stored under
+    it, and a 304 Not Modified is answered with the message stored alongside them.
+    """
+    validators = _cache.get(validators_key) if validators_key else None
+    if validators:
+        headers = dict(headers)
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
     try:
-        # print(f"Debug: Requesting URL: {api_endpoint}")
-        # print(f"Debug: Requesting PARAMS: {api_request_params}")
-        # print(f"Debug: Requesting HEADERS: {headers}")
-        response = requests.get(api_endpoint, params=api_request_params, headers=headers)
+        logger.debug("Requesting %s with params %s", api_endpoint, api_request_params)
+        response = _rate_limited_get(api_endpoint, params=api_request_params, headers=headers)
+        if validators and response.status_code == 304:
+            return validators["message"]
         response.raise_for_status()  # Raise an exception for HTTP errors
-        data = response.json()
-        return data.get("message", {}).get("items", []) # Safely access items
+        data = _json_loads(response.content)
+        message = data.get("message", {})
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if validators_key and (etag or last_modified):
+            _cache.set(validators_key, {"etag": etag, "last_modified": last_modified, "message": message},
+                       expire=SEARCH_CACHE_TTL)
+        return message
+    except requests.exceptions.RetryError as e: # The adapter's retries for 429/5xx ran out
+        logger.error("Giving up on %s with params %s after retries: %s", api_endpoint, api_request_params, e)
+        return None
     except requests.exceptions.RequestException as e:
-        print(f"Error during API request to {api_endpoint} with params {api_request_params}: {e}")
+        logger.error("Error during API request to %s with params %s: %s", api_endpoint, api_request_params, e)
         if hasattr(e, 'response') and e.response is not None:
-            print(f"Response content: {e.response.text}")
+            logger.error("Response content: %s", e.response.text)
         return None
     except ValueError as e: # Includes JSONDecodeError
-        print(f"Error decoding JSON response: {e}")
+        logger.error("Error decoding JSON response: %s", e)
         if 'response' in locals() and response is not None:
-            print(f"Response text: {response.text}")
+            logger.error("Response text: %s", response.text)
         return None
 
 
 def get_apa_citation_from_doi(doi, mailto_email=None, user_agent=None):
     """
     Retrieves an APA-formatted citation for a given DOI using CrossRef content negotiation.
+    Successful lookups are memoized in-process and cached on disk for CITATION_CACHE_TTL;
+    DOIs that Crossref reports as not found are remembered for NEGATIVE_CACHE_TTL.
 
     Args:
         doi (str): The DOI (Digital Object Identifier) for which to retrieve the citation.
@@ -184,219 +601,546 @@ def get_apa_citation_from_doi(doi, mailto_email=None, user_agent=None):
     Returns:
         str: The APA-formatted citation string, or None if an error occurs or citation not found.
     """
+    try:
+        return _get_apa_citation_cached(doi, mailto_email, user_agent)
+    except _LookupFailed:
+        return None
+
+
+@functools.lru_cache(maxsize=10000)
+def _get_apa_citation_cached(doi, mailto_email, user_agent):
+    """In-process memo in front of _fetch_apa_citation; misses raise _LookupFailed so they are retried."""
+    citation = _fetch_apa_citation(doi, mailto_email, user_agent)
+    if not citation:
+        raise _LookupFailed
+    return citation
+
+
+def _fetch_apa_citation(doi, mailto_email, user_agent):
+    """Looks the citation up in the disk cache, then via the /transform endpoint. Returns None on failure."""
+    cache_key = f"apa::{doi.lower()}"
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        return cached
+    if _cache.get(f"apa-404::{doi.lower()}"):
+        return None
+
     # Crossref API provides content negotiation for citations
     # We can request APA format directly
     url = f"{CROSSREF_API_BASE_URL}/works/{quote_plus(doi)}/transform" # Ensure DOI is URL-encoded
 
-    effective_mailto = mailto_email or DEFAULT_MAILTO_EMAIL
-    effective_user_agent = user_agent or DEFAULT_USER_AGENT.replace(DEFAULT_MAILTO_EMAIL, effective_mailto)
+    headers = {"Accept": "text/x-bibliography; style=apa", **_identity_headers(mailto_email, user_agent)}
+    # Several references citing the same DOI at once share a single transform request
+    request_key = _fingerprint([url, headers])
+    return _single_flight(request_key, lambda: _request_apa_citation(doi, url, headers))
 
-    headers = {
-        "Accept": "text/x-bibliography; style=apa",
-        "User-Agent": effective_user_agent
-        # Mailto is typically a query param or part of User-Agent for Crossref,
-        # not a separate header for this specific citation endpoint usually.
-    }
+
+def _request_apa_citation(doi, url, headers):
+    """Performs the /transform GET for _fetch_apa_citation and caches the outcome on disk."""
     try:
-        # print(f"Debug: Requesting Citation URL: {url}")
-        # print(f"Debug: Requesting Citation HEADERS: {headers}")
-        response = requests.get(url, headers=headers)
+        logger.debug("Requesting citation %s", url)
+        response = _rate_limited_get(url, headers=headers)
         response.raise_for_status()
+        if response.text: # Never cache an empty body
+            _cache.set(f"apa::{doi.lower()}", response.text, expire=CITATION_CACHE_TTL)
         return response.text
+    except requests.exceptions.RetryError as e: # Throttled or failing past the retry budget; not a 404
+        logger.error("Giving up on APA citation for DOI %s after retries: %s", doi, e)
+        return None
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching APA citation for DOI {doi}: {e}")
+        logger.error("Error fetching APA citation for DOI %s: %s", doi, e)
         if hasattr(e, 'response') and e.response is not None:
-            print(f"Response content: {e.response.text}")
+            logger.error("Response content: %s", e.response.text)
+            if e.response.status_code == 404:
+                _cache.set(f"apa-404::{doi.lower()}", True, expire=NEGATIVE_CACHE_TTL)
         return None
 
-# --- High-Level Search/Utility Functions ---
-def find_and_cite_reference(reference_text, expected_title=None, mailto_email=None, user_agent=None):
+
+def fetch_works_by_dois(dois, mailto_email=None, user_agent=None):
     """
-    Searches for a reference using its text, attempts to parse authors, year, and title
-    from the reference_text, then queries CrossRef. Results are scored based on matching
-    these parsed fields and the expected_title (if provided).
-    Returns an APA citation if a high-confidence match is found.
+    Retrieves the metadata needed for APA formatting for many DOIs at once, using
+    /works?filter=doi:D1,doi:D2,... in chunks of DOI_BATCH_SIZE instead of one
+    request per DOI.
 
     Args:
-        reference_text (str): The free-text of the reference to search for.
-        expected_title (str, optional): The specific title to match against. If not provided,
-                                        a title will be parsed from reference_text.
+        dois (list of str): The DOIs to look up.
         mailto_email (str, optional): Email for polite API usage.
         user_agent (str, optional): Custom User-Agent string.
 
     Returns:
-        str: An APA-formatted citation if a good match is found, otherwise a message indicating
-             the outcome (e.g., no results, low similarity, or error retrieving citation).
+        dict: Maps each found DOI (lowercased) to its work item. DOIs that Crossref doesn't
+              know, or whose chunk failed to download, are absent from the result.
+    """
+    unique_dois = list(dict.fromkeys(doi.strip().lower() for doi in dois if doi and doi.strip()))
+    works = {}
+    for start in range(0, len(unique_dois), DOI_BATCH_SIZE):
+        chunk = unique_dois[start:start + DOI_BATCH_SIZE]
+        search_params = {"raw_filters": [f"doi:{doi}" for doi in chunk], "select": APA_SELECT_FIELDS}
+        items = search_crossref_api(search_params, rows=len(chunk), mailto_email=mailto_email, user_agent=user_agent)
+        for item in items or []:
+            if item.get("DOI"):
+                works[item["DOI"].lower()] = item
+    return works
+
+
+# --- Local APA Formatting ---
+def _plain_text(text):
+    """Removes inline markup tags and decodes entities ("X <i>in vivo</i> &amp; Y" -> "X in vivo & Y")."""
+    return html.unescape(_MARKUP_TAG_RE.sub("", text or ""))
+
+
+def _apa_initials(given):
+    """Turns given names into APA initials: "Claude Elwood" -> "C. E.", "Jean-Paul" -> "J.-P."."""
+    initials = []
+    for part in _INITIALS_SPLIT_RE.split(given):
+        if part:
+            initials.append("-".join(f"{piece[0]}." for piece in part.split("-") if piece))
+    return " ".join(initials)
+
+def _apa_author_list(authors):
+    """Formats Crossref author objects as an APA 7 author list (up to 20 names, then an ellipsis)."""
+    names = []
+    for author_obj in authors:
+        if not isinstance(author_obj, dict):
+            continue
+        if author_obj.get("family"):
+            initials = _apa_initials(author_obj.get("given") or "")
+            names.append(f"{author_obj['family']}, {initials}" if initials else author_obj["family"])
+        elif author_obj.get("name"): # Group/organisational author
+            names.append(author_obj["name"])
+    if len(names) > 20:
+        return ", ".join(names[:19]) + ", . . . " + names[-1]
+    if len(names) > 1:
+        return ", ".join(names[:-1]) + ", & " + names[-1]
+    return names[0] if names else ""
+
+def format_apa(item):
+    """
+    Formats a Crossref work item (as returned with APA_SELECT_FIELDS) as an APA-style reference,
+    e.g. "Shannon, C. E. (1948). A mathematical theory of communication. Bell System Technical
+    Journal, 27(3), 379–423. https://doi.org/10.1002/j.1538-7305.1948.tb01338.x".
+    This avoids a second request to the /transform endpoint for items we already have.
+
+    Args:
+        item (dict): A Crossref work item.
+
+    Returns:
+        str: The formatted reference, or None if the item has no title to format.
+    """
+    title = _plain_text((item.get("title") or [""])[0]).strip()
+    if not title:
+        return None
+    if title[-1] not in ".?!":
+        title += "."
+
+    issued = ((item.get("issued") or {}).get("date-parts") or [[None]])[0]
+    year = str(issued[0]) if issued and issued[0] is not None else _first_year(item)
+    if year == "N/A":
+        year = "n.d."
+
+    parts = []
+    authors = _apa_author_list(item.get("author") or [])
+    if authors:
+        parts.append(authors if authors.endswith(".") else authors + ".")
+        parts.append(f"({year}).")
+        parts.append(title)
+    else: # APA moves the title into the author position when there are no authors
+        parts.append(title)
+        parts.append(f"({year}).")
+
+    source = _plain_text((item.get("container-title") or [""])[0]).strip()
+    if source:
+        if item.get("volume"):
+            source += f", {item['volume']}"
+            if item.get("issue"):
+                source += f"({item['issue']})"
+        if item.get("page"):
+            source += f", {item['page'].replace('-', '–')}"
+        parts.append(source + ".")
+
+    if item.get("DOI"):
+        parts.append(f"https://doi.org/{item['DOI']}")
+    return " ".join(parts)
+
+
+def get_apa_citations_bulk(dois, mailto_email=None, user_agent=None):
     """
+    Retrieves APA citations for many DOIs with as few requests as possible. format_apa is the
+    source of truth, as in find_and_cite_reference: the DOIs are fetched DOI_BATCH_SIZE at a
+    time via fetch_works_by_dois (whose searches are cached) and rendered locally. Only DOIs
+    the batch lookup doesn't return, or that format_apa can't render, fall back to Crossref's
+    /transform text via get_apa_citation_from_doi, so a given DOI is always rendered the same
+    way regardless of what earlier calls cached.
 
-    # Step 1: Parse authors, year, and title from reference_text
-    parsed_authors = _parse_authors_from_reference(reference_text)
-    parsed_year = _parse_year_from_reference(reference_text)
+    Args:
+        dois (list of str): The DOIs to cite.
+        mailto_email (str, optional): Email for polite API usage.
+        user_agent (str, optional): Custom User-Agent string.
 
-    # Use expected_title if provided, otherwise try to parse title from reference_text
-    title_to_match_against = expected_title
-    if not title_to_match_against:
-        title_to_match_against = _parse_title_from_reference(reference_text, parsed_authors, parsed_year)
+    Returns:
+        dict: Maps each requested DOI (lowercased) to its APA citation, or None if none was found.
+    """
+    citations = {doi.strip().lower(): None for doi in dois if doi and doi.strip()}
+    works = fetch_works_by_dois(list(citations), mailto_email=mailto_email, user_agent=user_agent)
+    for doi in citations:
+        citations[doi] = format_apa(works[doi]) if doi in works else None
+        if citations[doi] is None:
+            citations[doi] = get_apa_citation_from_doi(doi, mailto_email=mailto_email, user_agent=user_agent)
+    return citations
 
-    # print(f"Debug Parsed: Authors: {parsed_authors}, Year: {parsed_year}, Title to match: '{title_to_match_against}'")
 
-    # Step 2: Construct search_params for CrossRef API
-    search_params = {"keyword": reference_text} # query.bibliographic is a good general starting point
+# --- High-Level Search/Utility Functions ---
+# References shorter than this (after stripping) are rejected without querying Crossref
+MIN_REFERENCE_LENGTH = 20
 
-    # Add parsed fields to narrow down the search if they exist
-    if parsed_authors:
-        search_params["author"] = " ".join(parsed_authors) # Send as a single string; API handles it
-    if parsed_year:
-        search_params["publication_year_from"] = parsed_year
-        search_params["publication_year_to"] = parsed_year
-    if title_to_match_against and not expected_title: # If we parsed a title, add it to search query
-        search_params["title"] = title_to_match_against
-    elif expected_title : # If user provided an expected title, use that for a more specific query title
-         search_params["title"] = expected_title
+# --- CONFIDENCE THRESHOLD (Tunable Parameter) ---
+# This threshold determines the minimum score for a match to be considered confident.
+CONFIDENCE_THRESHOLD = 0.65
 
 
-    # print(f"Debug search_params: {search_params}")
+def _first_year(item):
+    """
+    Returns the publication year of a Crossref work item as a string, taken from
+    'published-print', then 'published-online', then 'created', or "N/A" if none has one.
+    """
+    for key in ("published-print", "published-online", "created"):
+        date_parts = (item.get(key) or {}).get("date-parts")
+        if date_parts and date_parts[0] and date_parts[0][0] is not None:
+            return str(date_parts[0][0])
+    return "N/A"
 
-    # Using a small number of rows initially, as the top results are most relevant
-    results = search_crossref_api(search_params, rows=5, mailto_email=mailto_email, user_agent=user_agent)
 
-    if not results:
-        return f"No API results found for query based on: {reference_text[:100]}..."
+def _combine_scores(title_score, author_score, year_score, has_expected_title):
+    """
+    Combines the per-field scores (each 0..1) into the overall confidence score.
+    Kept free of any dict/str work so the hot arithmetic can be compiled
+    (e.g. with mypyc or numba) independently of the rest of the scoring loop.
+    """
+    # Weights can be tuned. Title is often most important.
+    # If expected_title was provided by user, title_score is more reliable.
+    # If title was parsed from ref_string, it's less reliable.
+    # --- SCORING WEIGHTS (Tunable Parameters) ---
+    title_weight = 0.6 if has_expected_title else 0.4
+    author_weight = 0.3
+    year_weight = 0.1 if has_expected_title else 0.3 # Year becomes more important if title is parsed
+    # Ensure weights sum to 1 (or are normalized later if not)
+    # Current sum: (0.6+0.3+0.1 = 1.0) or (0.4+0.3+0.3 = 1.0)
+
+    return (title_weight * title_score) + \
+           (author_weight * author_score) + \
+           (year_weight * year_score)
+
+
+def _score_candidates(results, parsed_authors, parsed_year, title_to_match_against, expected_title):
+    """
+    Scores Crossref work items against the authors, year and title parsed from a reference.
 
+    Returns:
+        tuple: (best_item, best_score) for the highest-scoring item, or (None, -1.0) if results is empty.
+    """
     best_match_item = None
     highest_overall_score = -1.0
 
-    # Normalize the title to match against (from input)
-    normalized_input_title = ""
-    if title_to_match_against:
-        normalized_input_title = title_to_match_against.lower().strip()
-        normalized_input_title = re.sub(r'[^\w\s]', '', normalized_input_title) # Keep only word chars and spaces
-
+    # Crossref can return the same DOI more than once; score each work only once
+    seen_dois = set()
+    unique_results = []
+    for item in results:
+        doi = (item.get("DOI") or "").lower()
+        if doi and doi in seen_dois:
+            continue
+        seen_dois.add(doi)
+        unique_results.append(item)
+    results = unique_results
+
+    parsed_authors_lc = frozenset(pa.lower() for pa in parsed_authors)
+
+    # --- Title Scores ---
+    # Normalize the input title and every candidate title once, then score them all in one batch
+    normalized_input_title = _normalize_title(title_to_match_against)
+    candidate_titles = []
     for item in results:
-        # --- Title Score ---
         item_title_list = item.get("title")
         current_item_title_str = ""
         if item_title_list and isinstance(item_title_list, list) and item_title_list[0]:
             current_item_title_str = item_title_list[0]
+        candidate_titles.append(_normalize_title(current_item_title_str))
+    title_scores = _title_similarities(normalized_input_title, candidate_titles)
 
-        normalized_item_title = current_item_title_str.lower().strip()
-        normalized_item_title = re.sub(r'[^\w\s]', '', normalized_item_title)
-
-        title_score = 0.0
-        if normalized_input_title and normalized_item_title: # Ensure both titles are non-empty
-             title_score = SequenceMatcher(None, normalized_input_title, normalized_item_title).ratio()
-
+    for item, title_score in zip(results, title_scores):
         # --- Author Score ---
         author_score = 0.0
         item_authors_list = item.get("author", [])
         if parsed_authors and item_authors_list:
-            item_author_last_names = []
-            for author_obj in item_authors_list:
-                if isinstance(author_obj, dict) and author_obj.get("family"):
-                    item_author_last_names.append(author_obj.get("family").lower())
-
-            match_count = 0
-            for pa_norm in [pa.lower() for pa in parsed_authors]:
-                if pa_norm in item_author_last_names:
-                    match_count += 1
-            if parsed_authors: # Avoid division by zero
-                author_score = match_count / len(parsed_authors)
+            item_families = frozenset(author_obj["family"].lower() for author_obj in item_authors_list
+                                      if isinstance(author_obj, dict) and author_obj.get("family"))
+            author_score = len(parsed_authors_lc & item_families) / len(parsed_authors_lc)
         elif not parsed_authors: # If no authors parsed from input, don't penalize/reward based on authors
             author_score = 0.5 # Neutral score if input authors are unknown
 
         # --- Year Score ---
         year_score = 0.0
-        api_year_str = "N/A"
-        try:
-            # Try to get year from 'published-print', then 'published-online', then 'created'
-            year_sources = [
-                item.get("published-print", {}).get("date-parts", [[]])[0],
-                item.get("published-online", {}).get("date-parts", [[]])[0],
-                item.get("created", {}).get("date-parts", [[]])[0]
-            ]
-            for date_parts in year_sources:
-                if date_parts and date_parts[0] is not None: # Check if year part exists
-                    api_year_str = str(date_parts[0])
-                    break
-        except (IndexError, TypeError):
-            api_year_str = "N/A"
-
+        api_year_str = _first_year(item)
         if parsed_year and api_year_str == parsed_year:
             year_score = 1.0
         elif not parsed_year: # If no year parsed from input, neutral score
             year_score = 0.5
 
         # --- Overall Confidence Score ---
-        # Weights can be tuned. Title is often most important.
-        # If expected_title was provided by user, title_score is more reliable.
-        # If title was parsed from ref_string, it's less reliable.
-        # --- SCORING WEIGHTS (Tunable Parameters) ---
-        title_weight = 0.6 if expected_title else 0.4
-        author_weight = 0.3
-        year_weight = 0.1 if expected_title else 0.3 # Year becomes more important if title is parsed
-        # Ensure weights sum to 1 (or are normalized later if not)
-        # Current sum: (0.6+0.3+0.1 = 1.0) or (0.4+0.3+0.3 = 1.0)
-
-        overall_score = (title_weight * title_score) + \
-                        (author_weight * author_score) + \
-                        (year_weight * year_score)
-
-        # --- Uncomment for detailed scoring debug ---
-        # print(f"Debug Item: DOI: {item.get('DOI')}, Title: '{current_item_title_str[:60]}...'")
-        # print(f"  Parsed Fields: Authors: {parsed_authors}, Year: {parsed_year}, Input Title: '{title_to_match_against[:60]}'")
-        # print(f"  API Fields: Authors: {[a.get('family','N/A') for a in item_authors_list][:3]}, Year: {api_year_str}")
-        # print(f"  Scores: Title={title_score:.2f} (w:{title_weight:.1f}), Author={author_score:.2f} (w:{author_weight:.1f}), Year={year_score:.2f} (w:{year_weight:.1f})")
-        # print(f"  Overall Score: {overall_score:.2f}\n")
-        # --- End Debug ---
+        overall_score = _combine_scores(title_score, author_score, year_score, bool(expected_title))
+
+        logger.debug("Candidate %s: title=%.2f author=%.2f year=%.2f overall=%.2f",
+                     item.get("DOI"), title_score, author_score, year_score, overall_score)
 
         if overall_score > highest_overall_score:
             highest_overall_score = overall_score
-            best_match_item = item # Store the whole item
-            best_match_item["_calculated_score"] = overall_score # Attach score for later use
-            best_match_item["_matched_api_year"] = api_year_str # For debugging
-
-    if best_match_item:
-        # print(f"Debug: Best overall candidate DOI: {best_match_item.get('DOI')}, Final Score: {best_match_item['_calculated_score']:.2f}")
-
-        # --- CONFIDENCE THRESHOLD (Tunable Parameter) ---
-        # This threshold determines the minimum score for a match to be considered confident.
-        CONFIDENCE_THRESHOLD = 0.65
-
-        if best_match_item["_calculated_score"] >= CONFIDENCE_THRESHOLD:
-            doi = best_match_item.get("DOI")
-            if doi:
-                citation = get_apa_citation_from_doi(doi, mailto_email=mailto_email, user_agent=user_agent)
-                if citation:
-                    api_title = best_match_item.get('title',[""])[0]
-                    authors_display = ", ".join([a.get('family', '') for a in best_match_item.get('author', []) if a.get('family')])
-                    year_display = best_match_item["_matched_api_year"]
-
-                    # Return only the APA citation string for a confident, successful match
-                    return citation
-                else:
-                    return (f"Status: Matched DOI {doi} (Score: {best_match_item['_calculated_score']:.2f}), "
-                            f"but failed to retrieve APA citation. Matched Title: {best_match_item.get('title',[''])[0]}")
-            else: # Should not happen if we only consider items with DOI for citation
-                 return f"Status: Error - High confidence match (Score: {best_match_item['_calculated_score']:.2f}) found but item has no DOI."
-        else:
-            api_title = best_match_item.get('title',[""])[0]
-            return (f"Status: Low Confidence Match\n"
-                    f"Original Reference: {reference_text}\n"
-                    f"Input Title for Match: '{title_to_match_against}'\n"
-                    f"Highest score was {best_match_item['_calculated_score']:.2f} for title '{api_title}'. This is below the threshold of {CONFIDENCE_THRESHOLD}.")
+            best_match_item = item
+
+    return best_match_item, highest_overall_score
 
-    return (f"Status: No Confident Match Found\n"
-            f"Original Reference: {reference_text}\n"
-            f"Input Title for Match: '{title_to_match_against}'")
+
+# --- Query Cascade ---
+# Each step turns the parsed reference into search_params, or returns None if the
+# fields it needs are missing. Steps run cheapest/most specific first and the
+# cascade stops at the first one whose best candidate clears CONFIDENCE_THRESHOLD.
+def _q_doi(ref):
+    if ref["doi"]:
+        return {"raw_filters": [f"doi:{ref['doi']}"]}
+    return None
+
+def _q_title_year_author(ref):
+    if ref["title"] and ref["year"] and ref["authors"]:
+        return {"title": ref["title"], "author": " ".join(ref["authors"]),
+                "publication_year_from": ref["year"], "publication_year_to": ref["year"]}
+    return None
+
+def _q_title_year(ref):
+    if ref["title"] and ref["year"]:
+        return {"title": ref["title"], "publication_year_from": ref["year"], "publication_year_to": ref["year"]}
+    return None
+
+def _q_bibliographic(ref):
+    search_params = {"keyword": ref["text"]} # query.bibliographic is a good general fallback
+    # Still send the title and authors when we have them; for a reference without a year this
+    # is the only step that passes the (possibly caller-supplied) title to Crossref
+    if ref["title"]:
+        search_params["title"] = ref["title"]
+    if ref["authors"]:
+        search_params["author"] = " ".join(ref["authors"])
+    return search_params
+
+_QUERY_CASCADE = [_q_doi, _q_title_year_author, _q_title_year, _q_bibliographic]
+
+
+def find_and_cite_reference(reference_text, expected_title=None, mailto_email=None, user_agent=None):
+    """
+    Searches for a reference using its text, attempts to parse a DOI, authors, year, and title
+    from the reference_text, then queries CrossRef through a cascade of progressively broader
+    searches (DOI, title+year+author, title+year, bibliographic), stopping at the first one
+    that yields a high-confidence match. Results are scored based on matching these parsed
+    fields and the expected_title (if provided).
+    Returns an APA citation if a high-confidence match is found.
+
+    Args:
+        reference_text (str): The free-text of the reference to search for.
+        expected_title (str, optional): The specific title to match against. If not provided,
+                                        a title will be parsed from reference_text.
+        mailto_email (str, optional): Email for polite API usage.
+        user_agent (str, optional): Custom User-Agent string.
+
+    Returns:
+        str: An APA-formatted citation if a good match is found, otherwise a message indicating
+             the outcome (e.g., no results, low similarity, or error retrieving citation).
+    """
+
+    # Step 0: Don't spend API calls on input that cannot identify a work (empty, "ibid.", ...)
+    if not _is_searchable_reference(reference_text, expected_title):
+        return "Status: Reference too short/unstructured to search"
+
+    # Step 1: Parse DOI, authors, year, and title from reference_text
+    parsed = parse_reference(reference_text)
+    parsed_doi = parsed["doi"]
+    parsed_authors = parsed["authors"]
+    parsed_year = parsed["year"]
+
+    # Use expected_title if provided, otherwise use the title parsed from reference_text
+    title_to_match_against = expected_title or parsed["title_guess"]
+
+    logger.debug("Parsed reference: DOI=%s authors=%s year=%s title=%r",
+                 parsed_doi, parsed_authors, parsed_year, title_to_match_against)
+
+    # References that recently failed to produce a confident match are not re-searched
+    negative_cache_key = "neg::" + _fingerprint({"reference_text": reference_text, "expected_title": expected_title})
+    cached_outcome = _cache.get(negative_cache_key)
+    if cached_outcome is not None:
+        return cached_outcome
+
+    # Step 2: Run the query cascade, keeping the best candidate seen across all steps
+    parsed_reference = {"text": reference_text, "doi": parsed_doi, "authors": parsed_authors,
+                        "year": parsed_year, "title": title_to_match_against}
+    best_match_item = None
+    best_score = -1.0
+    best_level = None
+    request_failed = False
+
+    for build_query in _QUERY_CASCADE:
+        search_params = build_query(parsed_reference)
+        if search_params is None:
+            continue
+        # Using a small number of rows, as the top results are most relevant
+        results = search_crossref_api(search_params, rows=5, mailto_email=mailto_email, user_agent=user_agent)
+        if results is None: # Request failed (5xx, timeout, ...); try the next step but don't cache the outcome
+            request_failed = True
+            continue
+        item, score = _score_candidates(results, parsed_authors, parsed_year, title_to_match_against, expected_title)
+        if build_query is _q_doi:
+            # The DOI written in the reference identifies the work outright; a badly parsed
+            # title (e.g. Vancouver style) must not talk us out of an exact DOI hit
+            exact = next((r for r in results if (r.get("DOI") or "").lower() == parsed_doi.lower()), None)
+            if exact is not None:
+                item, score = exact, 1.0
+        if item is not None and score > best_score:
+            best_match_item, best_score = item, score
+            best_level = build_query.__name__.removeprefix("_q_")
+        if best_score >= CONFIDENCE_THRESHOLD:
+            break
+
+    if best_match_item is None:
+        outcome = f"No API results found for query based on: {reference_text[:100]}..."
+        if not request_failed:
+            _cache.set(negative_cache_key, outcome, expire=NEGATIVE_CACHE_TTL)
+        return outcome
+
+    logger.debug("Best candidate %s: score=%.2f query=%s", best_match_item.get("DOI"), best_score, best_level)
+
+    if best_score >= CONFIDENCE_THRESHOLD:
+        doi = best_match_item.get("DOI")
+        if doi:
+            # The matched item already carries the APA fields, so format it locally and only
+            # fall back to the /transform endpoint if that isn't possible
+            citation = format_apa(best_match_item) or get_apa_citation_from_doi(doi, mailto_email=mailto_email, user_agent=user_agent)
+            if citation:
+                # Return only the APA citation string for a confident, successful match
+                return citation
+            else:
+                return (f"Status: Matched DOI {doi} (Score: {best_score:.2f}, query: {best_level}), "
+                        f"but failed to retrieve APA citation. Matched Title: {best_match_item.get('title',[''])[0]}")
+        else: # Should not happen if we only consider items with DOI for citation
+             return f"Status: Error - High confidence match (Score: {best_score:.2f}, query: {best_level}) found but item has no DOI."
+
+    api_title = best_match_item.get('title',[""])[0]
+    outcome = (f"Status: Low Confidence Match\n"
+               f"Original Reference: {reference_text}\n"
+               f"Input Title for Match: '{title_to_match_against}'\n"
+               f"Highest score was {best_score:.2f} for title '{api_title}' (query: {best_level}). This is below the threshold of {CONFIDENCE_THRESHOLD}.")
+    if not request_failed:
+        _cache.set(negative_cache_key, outcome, expire=NEGATIVE_CACHE_TTL)
+    return outcome
+
+
+def find_and_cite_references_batch(reference_texts, expected_titles=None, max_workers=8, mailto_email=None, user_agent=None):
+    """
+    Runs find_and_cite_reference over many references concurrently. The work is
+    network-bound, so a small thread pool sharing the pooled HTTP session overlaps
+    the Crossref round-trips instead of waiting on each one in turn.
+
+    Args:
+        reference_texts (list of str): The free-text references to resolve.
+        expected_titles (list of str, optional): Expected titles, aligned with reference_texts.
+                                                 Use None entries where no title is known.
+        max_workers (int, optional): Maximum number of concurrent lookups. Defaults to 8, and is
+                                     capped at the rate limit Crossref currently advertises.
+        mailto_email (str, optional): Email for polite API usage.
+        user_agent (str, optional): Custom User-Agent string.
+
+    Returns:
+        list: The result of find_and_cite_reference for each reference, in input order.
+    """
+    reference_texts = list(reference_texts)
+    if expected_titles is None:
+        expected_titles = [None] * len(reference_texts)
+    if len(expected_titles) != len(reference_texts):
+        logger.error("expected_titles must be the same length as reference_texts.")
+        return None
+
+    def _cite(args):
+        reference_text, expected_title = args
+        return find_and_cite_reference(reference_text, expected_title, mailto_email=mailto_email, user_agent=user_agent)
+
+    # More workers than Crossref's per-interval request budget would only queue on the rate limiter
+    max_workers = max(1, min(max_workers, _RATE_LIMITER.capacity))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_cite, zip(reference_texts, expected_titles)))
+
+
+async def find_and_cite_many(reference_texts, expected_titles=None, max_concurrency=10, mailto_email=None, user_agent=None):
+    """
+    Async counterpart of find_and_cite_references_batch for callers that already run an
+    event loop. Each reference is resolved by find_and_cite_reference in a worker thread
+    (asyncio.to_thread) so the blocking HTTP calls never stall the loop, and a semaphore
+    caps how many lookups are in flight at once.
+
+    Args:
+        reference_texts (list of str): The free-text references to resolve.
+        expected_titles (list of str, optional): Expected titles, aligned with reference_texts.
+        max_concurrency (int, optional): Maximum number of concurrent lookups. Defaults to 10.
+        mailto_email (str, optional): Email for polite API usage.
+        user_agent (str, optional): Custom User-Agent string.
+
+    Returns:
+        list: The result of find_and_cite_reference for each reference, in input order.
+    """
+    reference_texts = list(reference_texts)
+    if expected_titles is None:
+        expected_titles = [None] * len(reference_texts)
+    if len(expected_titles) != len(reference_texts):
+        logger.error("expected_titles must be the same length as reference_texts.")
+        return None
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _resolve(reference_text, expected_title):
+        async with semaphore:
+            return await asyncio.to_thread(find_and_cite_reference, reference_text, expected_title,
+                                           mailto_email=mailto_email, user_agent=user_agent)
+
+    return await asyncio.gather(*(_resolve(r, t) for r, t in zip(reference_texts, expected_titles)))
 
 
 # --- Helper functions for parsing reference strings ---
+def parse_reference(ref_string):
+    """
+    Splits a free-text reference into the structured fields used to query CrossRef
+    (query.author, query.title and the from/until-pub-date filters) instead of sending
+    the whole string as one free-text query.
+
+    Args:
+        ref_string (str): The free-text reference, e.g. "Shannon, C. E. (1948). A mathematical ...".
+
+    Returns:
+        dict: {"doi": str or None, "authors": list of str, "year": str or None, "title_guess": str}
+    """
+    authors = _parse_authors_from_reference(ref_string)
+    year = _parse_year_from_reference(ref_string)
+    return {
+        "doi": _parse_doi_from_reference(ref_string),
+        "authors": authors,
+        "year": year,
+        "title_guess": _parse_title_from_reference(ref_string, authors, year),
+    }
+
 def _parse_authors_from_reference(ref_string):
     """
     Rudimentary parsing of author last names from a reference string.
     Focuses on patterns like "Author, A." or "Author1, A. & Author2, B."
     Returns a list of probable last names. This is a simplified parser.
     """
+    # Most reliable: APA-style "Surname, I." pairs in the part before the (year)
+    year_match = _YEAR_PAREN_RE.search(ref_string)
+    head = ref_string[:year_match.start()] if year_match else ref_string
+    surnames = _SURNAME_INITIAL_RE.findall(head)
+    if surnames:
+        return list(dict.fromkeys(surnames)) # Unique names, in order of appearance
+
     authors = []
     # Try to find text before a potential year pattern like (YYYY) or a title start
     # This is very heuristic.
@@ -407,28 +1151,56 @@ def _parse_authors_from_reference(ref_string):
     # Simplified: find capitalized words before a year or common title start cues
     # This regex looks for sequences of capitalized words, possibly with initials/et al.
     # Stops if it sees a year in parentheses or a quote indicating a title.
-    author_part_match = re.match(r"^(.*?)(?=\s*(?:\(\d{4}\)|\"\w|\'\w|[\w\s]+[.:]\s*\w))", ref_string)
+    author_part_match = _AUTHOR_HEAD_RE.match(ref_string)
     if author_part_match:
         author_segment = author_part_match.group(1)
         # Split by common delimiters like '&', 'and', ','
-        potential_authors = re.split(r'\s*&\s*|\s+and\s+|\s*,\s*(?=[A-Z])', author_segment)
+        potential_authors = _AUTHOR_SPLIT_RE.split(author_segment)
         for pa in potential_authors:
             # Take the first capitalized word as a likely last name
-            name_match = re.match(r"([A-Z][a-z'-]+)", pa.strip())
+            name_match = _NAME_RE.match(pa.strip())
             if name_match:
                 authors.append(name_match.group(1))
     return list(set(authors)) # Return unique names
 
+def _parse_doi_from_reference(ref_string):
+    """
+    Finds a DOI (e.g. "10.1038/s41586-021-03317-6") anywhere in a reference string,
+    including inside a https://doi.org/ link. Returns the DOI, or None.
+    """
+    match = _DOI_RE.search(ref_string)
+    if match:
+        doi = match.group(0).rstrip('.,;') # Drop sentence punctuation that trails the DOI
+        # DOIs may contain balanced parentheses, but a surplus ")" closes the text around it: "(doi:10.x/y)"
+        while doi.endswith(')') and doi.count(')') > doi.count('('):
+            doi = doi[:-1].rstrip('.,;')
+        return doi
+    return None
+
+def _is_searchable_reference(ref_string, expected_title=None):
+    """
+    Cheap structural check run before any HTTP call. A reference is worth searching if it
+    is at least MIN_REFERENCE_LENGTH characters long and has a year, a DOI, at least two
+    capitalized words, or an accompanying expected title.
+    """
+    ref_string = (ref_string or "").strip()
+    if len(ref_string) < MIN_REFERENCE_LENGTH:
+        return False
+    return bool(expected_title
+                or _YEAR_BARE_RE.search(ref_string)
+                or _DOI_RE.search(ref_string)
+                or len(_CAPITALIZED_WORD_RE.findall(ref_string)) >= 2)
+
 def _parse_year_from_reference(ref_string):
     """
     Parses a 4-digit year, typically enclosed in parentheses.
     Returns the year as a string, or None.
     """
-    match = re.search(r'\((\d{4})\)', ref_string)
+    match = _YEAR_PAREN_RE.search(ref_string)
     if match:
         return match.group(1)
     # Try without parentheses as a fallback
-    match = re.search(r'\b(\d{4})\b', ref_string)
+    match = _YEAR_BARE_RE.search(ref_string)
     if match:
         # Ensure it's a plausible year (e.g., not a page number)
         year_candidate = match.group(1)
@@ -454,12 +1226,12 @@ def _parse_title_from_reference(ref_string, authors, year):
     # For now, let's try to find the part after the year.
 
     if year:
-        year_match = re.search(r'(\(\s*' + re.escape(year) + r'\s*\)|' + re.escape(year) + r')\.?', temp_ref)
+        year_match = _year_bounded_re(year).search(temp_ref)
         if year_match:
             temp_ref = temp_ref[year_match.end():].strip()
             # Often the title is the first significant chunk of text after the year.
             # It might end before a journal name, "In:", "Vol.", "pp.", etc.
-            title_match = re.match(r'^(.*?)(?=\s+(?:In\s|Vol\.|[A-Z][a-zÀ-ÿ\s]+(?:Journal|Conference|Proceedings|Book|Press|University|Review)|https://doi\.org|doi:|$))', temp_ref)
+            title_match = _TITLE_HEAD_RE.match(temp_ref)
             if title_match:
                 title_candidate = title_match.group(1).strip().rstrip('.:,')
                 # Further clean up: if it's enclosed in quotes, remove them.
@@ -474,64 +1246,46 @@ def _parse_title_from_reference(ref_string, authors, year):
     if len(ref_string) > 120: # take last 120 chars if ref string is long and no other cues found
         title_candidate = ref_string[-120:].strip()
         # Attempt to remove trailing journal/page info if it looks like it
-        title_candidate = re.sub(r'\.\s+(?:[A-Z][\w\s&]+(?:Journal|Conf|Proc|Rev|Bull)|Vol\.|pp\.|\d+[:\-\(]).*$', '', title_candidate)
+        title_candidate = _TITLE_TAIL_RE.sub('', title_candidate)
         return title_candidate.strip('.:, ')
     return ref_string.strip('.:, ') # as a last resort, the (cleaned) whole string
 
 
 # --- Functions for Conceptual Backend Support for Alerts/RSS ---
-def get_new_works(search_criteria_params, since_datetime_str, date_type="from-index-date", rows=20, mailto_email=None, user_agent=None):
-    """
-    Retrieves works that are new or updated since a given datetime,
-    based on specified search criteria.
+# Date filters that would conflict with the polling window set by _new_works_params
+_DATE_PREFIXES = frozenset((
+    "from-created-date", "until-created-date",
+    "from-update-date", "until-update-date",
+    "from-index-date", "until-index-date",
+    "from-pub-date", "until-pub-date", # These are less likely but good to be cautious
+    "from-deposit-date", "until-deposit-date", # another type
+))
 
-    Args:
-        search_criteria_params (dict): Standard search parameters for the query.
-        since_datetime_str (str): ISO 8601 datetime string (e.g., "2023-01-01T00:00:00Z").
-                                    The function will search for items after this date.
-        date_type (str): The type of date filter to use. Options:
-                         "from-created-date": Matches based on when the DOI was first seen by Crossref.
-                         "from-update-date": Matches based on when the DOI was last updated by the publisher.
-                         "from-index-date": Matches based on when the DOI was last indexed by Crossref (most comprehensive for "newly available").
-        rows (int): Number of results to return.
-        mailto_email (str, optional): Email for Mailto header.
-        user_agent (str, optional): User-Agent string.
 
-    Returns:
-        list: A list of work items, or None if an error occurs.
+def _new_works_params(search_criteria_params, since_datetime_str, date_type):
+    """
+    Builds the search_params for get_new_works/iter_new_works: the caller's criteria plus
+    a date filter of the given type (replacing any conflicting date filters) and a matching
+    ascending sort. Returns None if the arguments are invalid.
     """
     if not isinstance(search_criteria_params, dict):
-        print("Error: search_criteria_params must be a dictionary.")
+        logger.error("search_criteria_params must be a dictionary.")
         return None
     if date_type not in ["from-created-date", "from-update-date", "from-index-date"]:
-        print(f"Error: Invalid date_type '{date_type}'. Must be one of 'from-created-date', 'from-update-date', 'from-index-date'.")
+        logger.error("Invalid date_type %r. Must be one of 'from-created-date', 'from-update-date', 'from-index-date'.", date_type)
         return None
 
     # Create a copy to avoid modifying the original params
     params_for_new_works = search_criteria_params.copy()
     
-    # Add or update the specific date filter
-    # Filters are comma-separated, so we need to handle existing filters carefully
-    existing_filters = params_for_new_works.get("filter", "")
-    new_date_filter = f"{date_type}:{since_datetime_str}"
-
-    if existing_filters:
-        # Check if a similar date filter already exists and replace it, or append
-        filters_list = existing_filters.split(',')
-        # Remove any existing filters of the chosen date_type or other from/until date types to avoid conflict
-        conflicting_date_prefixes = ["from-created-date", "until-created-date",
-                                     "from-update-date", "until-update-date",
-                                     "from-index-date", "until-index-date",
-                                     "from-pub-date", "until-pub-date", # These are less likely but good to be cautious
-                                     "from-deposit-date", "until-deposit-date"] # another type
-
-        # Remove any conflicting date filters
-        cleaned_filters = [f for f in filters_list if not any(f.startswith(prefix) for prefix in conflicting_date_prefixes)]
-
-        cleaned_filters.append(new_date_filter)
-        params_for_new_works["filter"] = ",".join(cleaned_filters)
-    else:
-        params_for_new_works["filter"] = new_date_filter
+    # Replace any conflicting date filters with the polling window. The caller's pre-joined
+    # "filter" string and raw_filters list are merged into one raw_filters list, which
+    # _build_filters passes through without another join/split round trip.
+    existing_filters = (params_for_new_works.pop("filter", None) or "").split(",")
+    existing_filters.extend(params_for_new_works.pop("raw_filters", None) or [])
+    cleaned_filters = [f for f in existing_filters if f and f.split(":", 1)[0] not in _DATE_PREFIXES]
+    cleaned_filters.append(f"{date_type}:{since_datetime_str}")
+    params_for_new_works["raw_filters"] = cleaned_filters
 
     # It's often useful to sort by the date used for polling
     # e.g., sort=indexed&order=asc
@@ -545,11 +1299,98 @@ def get_new_works(search_criteria_params, since_datetime_str, date_type="from-in
         params_for_new_works["sort"] = sort_field_map[date_type]
         params_for_new_works["order"] = "asc" # Get oldest new items first
 
-    # print(f"Debug: Params for get_new_works: {params_for_new_works}")
-    return search_crossref_api(params_for_new_works, rows=rows, mailto_email=mailto_email, user_agent=user_agent)
+    return params_for_new_works
+
+
+def get_new_works(search_criteria_params, since_datetime_str, date_type="from-index-date", rows=20, mailto_email=None, user_agent=None):
+    """
+    Retrieves works that are new or updated since a given datetime,
+    based on specified search criteria.
+
+    Args:
+        search_criteria_params (dict): Standard search parameters for the query.
+        since_datetime_str (str): ISO 8601 datetime string (e.g., "2023-01-01T00:00:00Z").
+                                    The function will search for items after this date.
+        date_type (str): The type of date filter to use. Options:
+                         "from-created-date": Matches based on when the DOI was first seen by Crossref.
+                         "from-update-date": Matches based on when the DOI was last updated by the publisher.
+                         "from-index-date": Matches based on when the DOI was last indexed by Crossref (most comprehensive for "newly available").
+        rows (int): Number of results to return.
+        mailto_email (str, optional): Email for the User-Agent and From headers.
+        user_agent (str, optional): User-Agent string.
+
+    Returns:
+        list: A list of work items, or None if an error occurs.
+    """
+    params_for_new_works = _new_works_params(search_criteria_params, since_datetime_str, date_type)
+    if params_for_new_works is None:
+        return None
+
+    logger.debug("Params for get_new_works: %s", params_for_new_works)
+    # Polling for new works must always see the latest data, so skip the search cache and
+    # instead revalidate the previous poll's response with a conditional request
+    message = _query_works(params_for_new_works, rows, mailto_email, user_agent, conditional=True)
+    if message is None:
+        return None
+    return message.get("items", [])
+
+
+class PagingError(Exception):
+    """
+    Raised by iter_new_works when a page request fails part-way through the walk, so that a
+    poller does not mistake a truncated walk for a complete one (and advance its watermark).
+    The number of items already yielded and the cursor of the failed page are attached.
+    """
+
+    def __init__(self, items_yielded, cursor):
+        super().__init__(f"Crossref page request failed after {items_yielded} items (cursor {cursor!r})")
+        self.items_yielded = items_yielded
+        self.cursor = cursor
+
+
+def iter_new_works(search_criteria_params, since_datetime_str, date_type="from-index-date", rows=100, mailto_email=None, user_agent=None):
+    """
+    Generator over *all* works new or updated since a given datetime, using Crossref's
+    cursor-based deep paging (cursor=*, then each response's next-cursor). Unlike offset
+    paging, the cost of each page does not grow with how far into the result set it is.
+
+    Args:
+        search_criteria_params (dict): Standard search parameters for the query.
+        since_datetime_str (str): ISO 8601 datetime string (e.g., "2023-01-01T00:00:00Z").
+        date_type (str): "from-created-date", "from-update-date" or "from-index-date" (see get_new_works).
+        rows (int): Page size for each request. Defaults to 100. Max 1000.
+        mailto_email (str, optional): Email for the User-Agent and From headers.
+        user_agent (str, optional): User-Agent string.
+
+    Yields:
+        dict: Work items, page by page.
+
+    Raises:
+        PagingError: If a page request fails; the walk is then incomplete.
+    """
+    params_for_new_works = _new_works_params(search_criteria_params, since_datetime_str, date_type)
+    if params_for_new_works is None:
+        return
+
+    cursor = "*"
+    items_yielded = 0
+    while cursor:
+        params_for_new_works["cursor"] = cursor
+        message = _query_works(params_for_new_works, rows, mailto_email, user_agent)
+        if message is None:
+            raise PagingError(items_yielded, cursor)
+        items = message.get("items", [])
+        if not items:
+            return
+        yield from items
+        items_yielded += len(items)
+        cursor = message.get("next-cursor")
 
 
 if __name__ == "__main__":
+    # Show request errors on stderr when run as a script (the library itself only logs)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
     # --- Example 1: Original find_and_cite_reference usage (now uses new backend) ---
     print("--- Example 1: Find and Cite Reference ---")
     dummy_reference_text = "The effect of climate change on biodiversity"
@@ -593,7 +1434,8 @@ if __name__ == "__main__":
     print("--- Example 4: Advanced Search - Title and Publication Type ---")
     advanced_params_title_type = {
         "title": "Applications of machine learning", # Broad title
-        "publication_type": "journal-article"
+        "publication_type": "journal-article",
+        "select": ("DOI", "title", "container-title")
     }
     results_title_type = search_crossref_api(advanced_params_title_type, rows=3, mailto_email=user_email)
     if results_title_type:
@@ -650,7 +1492,8 @@ if __name__ == "__main__":
     advanced_params_raw_filter = {
         "keyword": "quantum computing",
         "raw_filters": ["has-abstract:true"],
-        "publication_year_from": "2023"
+        "publication_year_from": "2023",
+        "select": ("DOI", "title", "abstract")
     }
     results_raw_filter = search_crossref_api(advanced_params_raw_filter, rows=2, mailto_email=user_email)
     if results_raw_filter:
@@ -681,7 +1524,8 @@ if __name__ == "__main__":
     alert_search_params = {
         "keyword": "artificial intelligence ethics", # More specific topic for alerts
         "publication_type": "journal-article",
-        "raw_filters": ["has-abstract:true"] # Example: only interested in those with abstracts
+        "raw_filters": ["has-abstract:true"], # Example: only interested in those with abstracts
+        "select": ("DOI", "title", "indexed")
     }
 
     print(f"Checking for new journal articles with abstracts on 'artificial intelligence ethics' since {since_timestamp_str} (using from-index-date)...")
@@ -725,18 +1569,20 @@ if __name__ == "__main__":
     problematic_reference = "Maine, R., & Bell, S. (2024). Financial Dependency and Infrastructure Debt in Small Island Developing States."
     # We don't provide an expected_title here, to rely on the parser and multi-factor matching.
     # If we had an exact expected title from a bibliography, we could provide it.
-    accuracy_test_result = find_and_cite_reference(problematic_reference, mailto_email=user_email)
-    print(f"Result for problematic reference:\n{accuracy_test_result}\n")
-
     another_problematic_ref = "Shannon, C. E. (1948). A mathematical theory of communication. Bell System Technical Journal, 27(3), 379-423."
     shannon_expected_title = "A mathematical theory of communication" # Providing expected title
-    accuracy_test_result_2 = find_and_cite_reference(another_problematic_ref, expected_title=shannon_expected_title, mailto_email=user_email)
-    print(f"Result for Shannon reference (with expected title):\n{accuracy_test_result_2}\n")
 
     # Test with a known good DOI to see if it can find it
     # Reference for DOI: 10.1038/s41586-021-03317-6 (DeepMind AlphaFold paper)
     alphafold_ref_text = "Jumper, J., et al. (2021). Highly accurate protein structure prediction with AlphaFold. Nature, 596(7873), 583-589."
     alphafold_expected_title = "Highly accurate protein structure prediction with AlphaFold"
-    alphafold_result = find_and_cite_reference(alphafold_ref_text, expected_title=alphafold_expected_title, mailto_email=user_email)
+
+    # Resolve all three concurrently rather than one after another
+    accuracy_test_result, accuracy_test_result_2, alphafold_result = find_and_cite_references_batch(
+        [problematic_reference, another_problematic_ref, alphafold_ref_text],
+        [None, shannon_expected_title, alphafold_expected_title],
+        mailto_email=user_email)
+    print(f"Result for problematic reference:\n{accuracy_test_result}\n")
+    print(f"Result for Shannon reference (with expected title):\n{accuracy_test_result_2}\n")
     print(f"Result for AlphaFold reference:\n{alphafold_result}\n")
 